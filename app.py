@@ -1,26 +1,74 @@
-from flask import Flask, render_template, redirect, url_for, flash, request, jsonify, send_from_directory, session
+from flask import Flask, render_template, redirect, url_for, flash, request, jsonify, send_from_directory, session, g, abort, Response, stream_with_context
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 from flask_migrate import Migrate
 from flask_wtf.csrf import CSRFProtect
-from datetime import datetime, timedelta, timezone
+from flask_caching import Cache
+from flask_compress import Compress
+from jinja2 import FileSystemBytecodeCache
+from datetime import datetime, timedelta
 from config import Config
-from models import db, User, Task, Reminder, Progress, Exam
+from models import db, User, Task, Reminder, Progress, Exam, UTC, utcnow, request_now
 from forms import RegistrationForm, LoginForm, TaskForm, ReminderForm, ProgressForm, TwoFactorForm, Enable2FAForm
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.triggers.date import DateTrigger
+from sqlalchemy import func, case, select, insert, update, delete, literal
 from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import selectinload, raiseload, aliased
 import os
+import socket
+import threading
+import time
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 import csv
 from io import StringIO, BytesIO
 import qrcode
 import base64
+import hashlib
+import math
+import zlib
+from functools import lru_cache
+import orjson
+import click
+import redis
 
 app = Flask(__name__)
 app.config.from_object(Config)
 
+# Log records are handed to a queue and written out by a background listener
+# thread, so request and scheduler threads never wait on the stream
+log_queue = queue.SimpleQueue()
+log_handler = logging.StreamHandler()
+log_handler.setFormatter(logging.Formatter('[%(asctime)s] %(levelname)s in %(module)s: %(message)s'))
+logger = logging.getLogger('tasknest')
+logger.setLevel(app.config['LOG_LEVEL'])
+logger.addHandler(QueueHandler(log_queue))
+logger.propagate = False
+log_listener = None
+
+
+def start_log_listener():
+    """Start the thread that drains the log queue (again in each forked worker)"""
+    global log_listener
+    log_listener = QueueListener(log_queue, log_handler)
+    log_listener.start()
+    atexit.register(log_listener.stop)
+
+
+start_log_listener()
+
+# Reuse compiled templates across workers and restarts instead of re-parsing them
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(app.config['JINJA_BYTECODE_CACHE_DIR'])
+
 # Initialize extensions
 db.init_app(app)
 migrate = Migrate(app, db)
 csrf = CSRFProtect(app)
+cache = Cache(app)
+Compress(app)
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'login'
@@ -28,96 +76,374 @@ login_manager.login_message = 'Please log in to access this page.'
 login_manager.login_message_category = 'info'
 
 # Scheduler for reminders
-scheduler = BackgroundScheduler(daemon=True)
+# Reminder jobs only wait on the database, so a couple of threads is plenty
+# (APScheduler defaults to a pool of 10). Runs that were missed while the process
+# was busy or asleep are collapsed into a single run.
+scheduler = BackgroundScheduler(
+    daemon=True,
+    executors={'default': ThreadPoolExecutor(2)},
+    job_defaults={'coalesce': True, 'misfire_grace_time': 60}
+)
 scheduler_started = False
 
+# Only one process across all workers/hosts runs the reminder jobs. With REDIS_URL
+# set, the leader holds this key (SET NX EX) and refreshes it on a heartbeat. Without
+# Redis there is nothing to share a lock through, so the process that starts the
+# scheduler leads (Gunicorn starts it in a single worker, see gunicorn.conf.py).
+SCHEDULER_LEADER_KEY = 'tasknest:scheduler:leader'
+SCHEDULER_LEADER_TIMEOUT = 60
+SCHEDULER_HEARTBEAT_SECONDS = 30
+scheduler_id = None
+scheduler_leader = False
+# True while the PostgreSQL change listener's last probe came back and the database
+# has the reminders_changed trigger; the heartbeat then leaves re-arming to notifications
+reminder_listener_active = False
+# Channel the listener notifies itself on to check that notifications still arrive
+REMINDER_LISTENER_PROBE = 'reminders_listener_probe'
+leader_redis = redis.Redis.from_url(app.config['REDIS_URL']) if app.config['REDIS_URL'] else None
+# Extends the lock's expiry only while this process still owns it
+refresh_leader_lock = leader_redis.register_script("""
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('expire', KEYS[1], ARGV[2])
+    end
+    return 0
+""") if leader_redis else None
+
+# Dashboard context and calendar feed are cached per user and dropped whenever
+# their tasks or reminders change
+DASHBOARD_CACHE_TIMEOUT = 300  # 5 minutes
+
+# Maximum number of reminders processed per scheduler run
+REMINDER_BATCH_SIZE = 500
+
+FAVICON_MAX_AGE = 60 * 60 * 24 * 30  # 30 days
+
+TASKS_PER_PAGE = 50
+
+# Rows fetched per round trip when streaming the CSV export
+EXPORT_BATCH_SIZE = 500
+
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    # Reuse the user already loaded during this request, otherwise use the
+    # identity-map aware primary key lookup
+    user_id = int(user_id)
+    user = g.get('_user')
+    if user is None or user.id != user_id:
+        user = db.session.get(User, user_id)
+        g._user = user
+    return user
+
+
+def json_response(data):
+    """Serialize data with orjson, which handles datetimes natively and is faster than jsonify.
+    
+    Naive datetimes are stored as UTC, so they are written with a +00:00 offset.
+    """
+    return app.response_class(orjson.dumps(data, option=orjson.OPT_NAIVE_UTC), mimetype='application/json')
+
+
+def gzip_chunks(chunks):
+    """Gzip a stream of text chunks as they are produced.
+    
+    Flask-Compress only compresses buffered responses (see COMPRESS_STREAMS), so
+    streamed downloads compress themselves. Level 1 is cheap and still shrinks CSV
+    several times over.
+    """
+    compressor = zlib.compressobj(1, zlib.DEFLATED, 31)  # wbits=31 writes a gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def get_owned_or_404(model, object_id):
+    """Load a row by primary key, or 404 if it is missing or belongs to another user"""
+    obj = db.session.get(model, object_id)
+    # Same response either way, so other users' ids cannot be probed
+    if obj is None or obj.user_id != current_user.id:
+        abort(404)
+    return obj
+
+
+def local_to_utc(local_dt):
+    """Convert a naive server-local datetime (as submitted in forms) to naive UTC for storage"""
+    # astimezone() on a naive datetime uses the system zone's offset for that
+    # moment, so dates on the other side of a DST change convert correctly
+    return local_dt.astimezone(UTC).replace(tzinfo=None)
+
+
+def user_cache_generation_key(user_id):
+    return f'gen:{user_id}'
+
 
+def user_cache_generation(user_id):
+    """Generation of a user's cached pages; read it before loading the rows to cache"""
+    return cache.get(user_cache_generation_key(user_id)) or 0
 
-def check_reminders():
+
+def dashboard_cache_key(user_id, generation):
+    return f'dash:{user_id}:{generation}'
+
+
+def api_tasks_cache_key(user_id, generation):
+    return f'api_tasks:{user_id}:{generation}'
+
+
+def invalidate_user_cache(user_id):
+    """Retire a user's cached dashboard and calendar feed after their tasks or reminders change.
+    
+    The generation is bumped rather than the entries deleted: a request that loaded
+    its rows before the change still writes its result under the old generation,
+    where nothing reads it again, instead of putting stale data back in place.
+    """
+    cache.cache.inc(user_cache_generation_key(user_id))
+
+
+def check_reminders(retry_on_disconnect=True):
     """Background task to check and send reminders"""
     try:
         with app.app_context():
-            now = datetime.now(timezone.utc)
-            print(f"[CHECK] Reminder check running at {now.strftime('%Y-%m-%d %H:%M:%S UTC')}")
+            now = utcnow()
+            logger.debug("Reminder check running at %s UTC", now)
             
-            # Get all unsent reminders
-            all_unsent = Reminder.query.filter(Reminder.is_sent == False).all()
-            print(f"[INFO] Total unsent reminders in database: {len(all_unsent)}")
+            # Backlog size is a diagnostic only; count it in SQL and only when it will be logged
+            if logger.isEnabledFor(logging.DEBUG):
+                unsent_count = db.session.query(func.count(Reminder.id))\
+                    .filter(Reminder.is_sent == False).scalar()
+                logger.debug("Total unsent reminders in database: %d", unsent_count)
             
-            # Check which ones are due
-            pending_reminders = Reminder.query.filter(
+            # Mark due reminders as sent and return them in a single statement. FOR UPDATE
+            # SKIP LOCKED (PostgreSQL) lets concurrent schedulers claim disjoint rows.
+            # Work is capped per run; any backlog is drained by the follow-up check that
+            # schedule_next_reminder() queues immediately for overdue reminders.
+            due_ids = select(Reminder.id).where(
                 Reminder.reminder_time <= now,
                 Reminder.is_sent == False
-            ).all()
+            ).order_by(Reminder.reminder_time.asc())\
+                .limit(REMINDER_BATCH_SIZE)\
+                .with_for_update(skip_locked=True)
+            try:
+                sent_reminders = db.session.execute(
+                    update(Reminder)
+                    .where(Reminder.id.in_(due_ids))
+                    .values(is_sent=True)
+                    .returning(Reminder.id, Reminder.title, Reminder.message,
+                               Reminder.reminder_time, Reminder.user_id)
+                    .execution_options(synchronize_session=False)
+                ).all()
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
             
-            print(f"[INFO] Reminders due now: {len(pending_reminders)}")
+            logger.debug("Reminders due now: %d", len(sent_reminders))
             
-            for reminder in pending_reminders:
-                # In a production app, you would send email/push notification here
-                print(f"[REMINDER] TRIGGERED: {reminder.title} - {reminder.message}")
-                print(f"   User: {reminder.user.username} (ID: {reminder.user_id})")
-                print(f"   Scheduled: {reminder.reminder_time}")
-                print(f"   Current: {now}")
-                reminder.is_sent = True
+            if sent_reminders:
+                notified_user_ids = {reminder.user_id for reminder in sent_reminders}
+                usernames = dict(
+                    db.session.query(User.id, User.username).filter(User.id.in_(notified_user_ids)).all()
+                )
+                
+                for reminder in sent_reminders:
+                    # In a production app, you would send email/push notification here
+                    logger.info(
+                        "Reminder triggered: %s - %s (user %s, ID %s; scheduled %s, now %s)",
+                        reminder.title, reminder.message, usernames.get(reminder.user_id),
+                        reminder.user_id, reminder.reminder_time, now
+                    )
+                
+                logger.info("Marked %d reminder(s) as sent", len(sent_reminders))
+                
+                for user_id in notified_user_ids:
+                    invalidate_user_cache(user_id)
             
-            if pending_reminders:
-                db.session.commit()
-                print(f"[SUCCESS] Marked {len(pending_reminders)} reminder(s) as sent")
+            schedule_next_reminder()
     except OperationalError as e:
-        print(f"[ERROR] Database connection error in reminder check: {e}")
-    except Exception as e:
-        print(f"[ERROR] Error checking reminders: {e}")
-        import traceback
-        traceback.print_exc()
+        if e.connection_invalidated and retry_on_disconnect:
+            # A pooled connection went stale while idle (pool_pre_ping is off by default).
+            # The pool has already discarded it, so an immediate retry gets a fresh one.
+            logger.warning("Database connection dropped during reminder check, retrying")
+            check_reminders(retry_on_disconnect=False)
+        else:
+            logger.error("Database connection error in reminder check: %s", e)
+    except Exception:
+        logger.exception("Error checking reminders")
+
+
+def schedule_next_reminder():
+    """Schedule a one-off reminder check at the time the next pending reminder is due.
+    
+    Must be called inside an application context.
+    """
+    if not scheduler.running or not scheduler_leader:
+        return
+    
+    try:
+        next_time = db.session.query(func.min(Reminder.reminder_time))\
+            .filter(Reminder.is_sent == False).scalar()
+    except OperationalError as e:
+        logger.error("Database connection error while scheduling next reminder: %s", e)
+        return
+    
+    if next_time is None:
+        # Nothing pending; the hourly safety check will pick up anything missed
+        if scheduler.get_job('next_reminder'):
+            scheduler.remove_job('next_reminder')
+        return
+    
+    # Reminder times are stored as naive UTC; overdue reminders are checked right away.
+    # A second instance is allowed so a check can queue its own follow-up run while a
+    # backlog is being drained.
+    run_date = max(next_time.replace(tzinfo=UTC), datetime.now(UTC))
+    job = scheduler.get_job('next_reminder')
+    if job and job.next_run_time == run_date:
+        return
+    scheduler.add_job(
+        func=check_reminders,
+        trigger=DateTrigger(run_date=run_date),
+        id='next_reminder',
+        replace_existing=True,
+        max_instances=2
+    )
+    logger.debug("Next reminder check scheduled for %s", run_date)
+
+
+def hold_scheduler_leadership():
+    """Take the scheduler leader lock, or refresh it if this process already holds it"""
+    if leader_redis is None:
+        return True
+    try:
+        # A lock whose holder stopped refreshing it has expired and is free again
+        if leader_redis.set(SCHEDULER_LEADER_KEY, scheduler_id, nx=True, ex=SCHEDULER_LEADER_TIMEOUT):
+            return True
+        return bool(refresh_leader_lock(
+            keys=[SCHEDULER_LEADER_KEY], args=[scheduler_id, SCHEDULER_LEADER_TIMEOUT]
+        ))
+    except redis.RedisError as e:
+        # Keep the current role until Redis is reachable again; a brief overlap of two
+        # leaders is harmless because check_reminders claims rows with FOR UPDATE SKIP LOCKED
+        logger.error("Could not reach Redis for the scheduler leader lock: %s", e)
+        return scheduler_leader
+
+
+def scheduler_heartbeat():
+    """Keep the reminder jobs running on exactly one process"""
+    global scheduler_leader
+    was_leader = scheduler_leader
+    scheduler_leader = hold_scheduler_leadership()
+    
+    if scheduler_leader:
+        if not was_leader:
+            logger.info("%s is now the reminder scheduler leader", scheduler_id)
+            # Hourly safety check in case a reminder was missed
+            scheduler.add_job(
+                func=check_reminders, 
+                trigger="interval", 
+                hours=1, 
+                id='reminder_check',
+                replace_existing=True,
+                max_instances=1
+            )
+        # Arm the next check on taking over. After that, reminders created by other
+        # processes arrive as notifications; without a change listener (SQLite, or a
+        # database created before the trigger existed) each beat re-checks instead.
+        if not was_leader or not reminder_listener_active:
+            with app.app_context():
+                schedule_next_reminder()
+    elif was_leader:
+        logger.info("%s lost the reminder scheduler leadership", scheduler_id)
+        for job_id in ('reminder_check', 'next_reminder'):
+            if scheduler.get_job(job_id):
+                scheduler.remove_job(job_id)
+
+
+def listen_for_reminder_changes():
+    """Re-arm the next reminder check whenever the reminders table changes (PostgreSQL only).
+    
+    The notifications come from the reminders_changed trigger, so reminders created
+    by other worker processes are picked up immediately instead of on the next heartbeat.
+    LISTEN needs a direct (or session-pooled) connection; behind a transaction-mode
+    pooler the probe below never comes back and the heartbeat keeps re-arming instead.
+    """
+    global reminder_listener_active
+    import psycopg
+    with app.app_context():
+        dsn = db.engine.url.set(drivername='postgresql').render_as_string(hide_password=False)
+    while True:
+        try:
+            # Keepalives and tcp_user_timeout turn a connection silently dropped by a
+            # NAT or proxy into an error instead of a wait that never ends
+            with psycopg.connect(
+                dsn, autocommit=True,
+                keepalives=1, keepalives_idle=SCHEDULER_HEARTBEAT_SECONDS,
+                keepalives_interval=10, keepalives_count=3,
+                tcp_user_timeout=SCHEDULER_HEARTBEAT_SECONDS * 1000
+            ) as conn:
+                conn.execute('LISTEN reminders_changed')
+                conn.execute(f'LISTEN {REMINDER_LISTENER_PROBE}')
+                has_trigger = conn.execute(
+                    "SELECT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'reminders_changed')"
+                ).fetchone()[0]
+                # Catch up on changes made while the listener was not connected
+                with app.app_context():
+                    schedule_next_reminder()
+                while True:
+                    # Each window starts with a NOTIFY to ourselves; only if it comes
+                    # back are notifications known to be reaching this connection
+                    conn.execute(f'NOTIFY {REMINDER_LISTENER_PROBE}')
+                    probe_seen = False
+                    for notify in conn.notifies(timeout=SCHEDULER_HEARTBEAT_SECONDS):
+                        if notify.channel == REMINDER_LISTENER_PROBE:
+                            probe_seen = True
+                        else:
+                            with app.app_context():
+                                schedule_next_reminder()
+                    if not probe_seen:
+                        logger.warning("Reminder change listener is not receiving notifications, reconnecting")
+                        break
+                    reminder_listener_active = has_trigger
+        except Exception as e:
+            logger.error("Reminder change listener failed, reconnecting: %s", e)
+        finally:
+            reminder_listener_active = False
+        time.sleep(SCHEDULER_HEARTBEAT_SECONDS)
 
 
 def start_scheduler():
     """Start the background scheduler"""
-    global scheduler_started
+    global scheduler_started, scheduler_id
     if not scheduler_started:
+        # Set here rather than at import so forked Gunicorn workers get their own id
+        scheduler_id = f'{socket.gethostname()}:{os.getpid()}'
         try:
-            # Remove existing job if present
-            if scheduler.get_job('reminder_check'):
-                scheduler.remove_job('reminder_check')
-            
             # Start the scheduler first
             if not scheduler.running:
                 scheduler.start()
-                print("[DEBUG] APScheduler started")
+                logger.debug("APScheduler started")
             
-            # Add the job
+            # Runs straight away, then keeps the leader lock fresh
             scheduler.add_job(
-                func=check_reminders, 
-                trigger="interval", 
-                seconds=30, 
-                id='reminder_check',
+                func=scheduler_heartbeat,
+                trigger="interval",
+                seconds=SCHEDULER_HEARTBEAT_SECONDS,
+                id='scheduler_heartbeat',
                 replace_existing=True,
-                max_instances=1
+                max_instances=1,
+                next_run_time=datetime.now(UTC)
             )
             
-            scheduler_started = True
-            print("[SUCCESS] Reminder scheduler started successfully (checks every 30 seconds)")
-            print(f"[INFO] Scheduler running: {scheduler.running}")
-            print(f"[INFO] Jobs scheduled: {len(scheduler.get_jobs())}")
-            print(f"[INFO] Next check in 30 seconds")
+            with app.app_context():
+                if db.engine.dialect.name == 'postgresql':
+                    threading.Thread(target=listen_for_reminder_changes, daemon=True).start()
             
-            # Run an immediate test check (in 3 seconds)
-            scheduler.add_job(
-                func=check_reminders,
-                trigger='date',
-                run_date=datetime.now() + timedelta(seconds=3),
-                id='test_check'
-            )
-            print("[INFO] Test check scheduled for 3 seconds from now")
+            scheduler_started = True
+            logger.info("Reminder scheduler started (checks run when reminders are due)")
             
-        except Exception as e:
-            print(f"[ERROR] Error starting scheduler: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error starting scheduler")
 
 
 # Routes
@@ -173,18 +499,23 @@ def login():
         
         # Check if account is locked
         if user.is_account_locked():
-            lockout_time = (user.account_locked_until - datetime.utcnow()).total_seconds() / 60
+            lockout_time = (user.account_locked_until - utcnow()).total_seconds() / 60
             flash(f'Account is locked due to multiple failed login attempts. Try again in {int(lockout_time)} minutes.', 'danger')
             return render_template('login.html', form=form)
         
         # Verify password
         if not user.check_password(form.password.data):
+            # A lock that has run out starts a fresh count
+            if user.account_locked_until:
+                user.failed_login_attempts = 0
+                user.account_locked_until = None
+            
             # Increment failed attempts
             user.failed_login_attempts += 1
             
             # Lock account after 5 failed attempts for 15 minutes
             if user.failed_login_attempts >= 5:
-                user.account_locked_until = datetime.utcnow() + timedelta(minutes=15)
+                user.account_locked_until = utcnow() + timedelta(minutes=15)
                 db.session.commit()
                 flash('Account locked due to too many failed login attempts. Please try again in 15 minutes.', 'danger')
             else:
@@ -194,20 +525,19 @@ def login():
             
             return render_template('login.html', form=form)
         
-        # Reset failed attempts on successful password verification
-        user.failed_login_attempts = 0
-        user.account_locked_until = None
-        
         # Check if 2FA is enabled
         if user.two_factor_enabled:
+            # Reset failed attempts on successful password verification
+            user.failed_login_attempts = 0
+            user.account_locked_until = None
+            
             # Store user_id in session temporarily for 2FA verification
             session['pending_2fa_user_id'] = user.id
             db.session.commit()
             return redirect(url_for('verify_2fa'))
         
-        # Complete login if no 2FA
-        user.last_login = datetime.utcnow()
-        db.session.commit()
+        # Complete login if no 2FA (also commits a password hash upgrade)
+        User.record_successful_login(user.id)
         
         login_user(user)
         next_page = request.args.get('next')
@@ -228,7 +558,7 @@ def verify_2fa():
         flash('Invalid session. Please login again.', 'danger')
         return redirect(url_for('login'))
     
-    user = User.query.get(user_id)
+    user = db.session.get(User, user_id)
     if not user:
         session.pop('pending_2fa_user_id', None)
         flash('User not found.', 'danger')
@@ -241,8 +571,7 @@ def verify_2fa():
             session.pop('pending_2fa_user_id', None)
             
             # Update last login
-            user.last_login = datetime.utcnow()
-            db.session.commit()
+            User.record_successful_login(user.id)
             
             # Complete login
             login_user(user)
@@ -265,7 +594,7 @@ def logout():
         logout_user()
         flash(f'Goodbye {username}! You have been logged out successfully.', 'success')
     except Exception as e:
-        print(f"[ERROR] Logout error: {str(e)}")
+        logger.error("Logout error: %s", e)
         flash('An error occurred during logout.', 'error')
     return redirect(url_for('index'))
 
@@ -273,43 +602,81 @@ def logout():
 @app.route('/dashboard')
 @login_required
 def dashboard():
-    # Get statistics
-    total_tasks = Task.query.filter_by(user_id=current_user.id).count()
-    completed_tasks = Task.query.filter_by(user_id=current_user.id, status='completed').count()
-    
-    # Calculate active tasks (pending + in_progress)
-    active_tasks = Task.query.filter_by(user_id=current_user.id)\
-        .filter(Task.status.in_(['pending', 'in_progress'])).count()
-    
-    # Get upcoming tasks
-    upcoming_tasks = Task.query.filter_by(user_id=current_user.id)\
-        .filter(Task.deadline >= datetime.utcnow())\
-        .order_by(Task.deadline.asc())\
-        .limit(5).all()
-    
-    # Get overdue tasks
-    overdue_tasks = Task.query.filter_by(user_id=current_user.id)\
-        .filter(Task.deadline < datetime.utcnow(), Task.status != 'completed')\
-        .order_by(Task.deadline.asc())\
-        .all()
+    cache_key = dashboard_cache_key(current_user.id, user_cache_generation(current_user.id))
+    context = cache.get(cache_key)
+    if context is not None:
+        return render_template('dashboard.html', now=request_now(), **context)
+    
+    # Same timestamp as the Task.is_overdue filter below, so no task falls between the lists
+    now = request_now()
+    
+    # Get statistics (total, completed and active tasks) and the completion rate,
+    # rounded to one decimal place, in a single aggregate query
+    total_expr = func.count(Task.id)
+    completed_expr = func.coalesce(func.sum(case((Task.status == 'completed', 1), else_=0)), 0)
+    total_tasks, completed_tasks, active_tasks, completion_rate = db.session.query(
+        total_expr,
+        completed_expr,
+        func.coalesce(func.sum(case((Task.status.in_(['pending', 'in_progress']), 1), else_=0)), 0),
+        func.coalesce(
+            func.round(db.cast(completed_expr * 100.0 / func.nullif(total_expr, 0), db.Numeric), 1), 0
+        )
+    ).filter(Task.user_id == current_user.id).one()
+    
+    # The lists below select only the columns the template renders, as plain dicts,
+    # so the cached context holds no ORM instances
+    
+    # Get upcoming tasks (nothing to look up for a user without tasks)
+    upcoming_tasks = []
+    if total_tasks:
+        upcoming_tasks = [dict(row) for row in db.session.execute(
+            select(Task.id, Task.title, Task.description, Task.priority, Task.category, Task.deadline)
+            .where(Task.user_id == current_user.id, Task.deadline >= now)
+            .order_by(Task.deadline.asc())
+            .limit(5)
+        ).mappings()]
+    
+    # Get overdue tasks. Only pending and in-progress tasks can be overdue.
+    overdue_tasks = []
+    if active_tasks:
+        overdue_tasks = [dict(row) for row in db.session.execute(
+            select(Task.id, Task.title, Task.deadline)
+            .where(Task.user_id == current_user.id, Task.is_overdue)
+            .order_by(Task.deadline.asc())
+        ).mappings()]
     
     # Get upcoming reminders
-    upcoming_reminders = Reminder.query.filter_by(user_id=current_user.id, is_sent=False)\
-        .filter(Reminder.reminder_time >= datetime.utcnow())\
-        .order_by(Reminder.reminder_time.asc())\
-        .limit(5).all()
+    upcoming_reminders = [dict(row) for row in db.session.execute(
+        select(Reminder.title, Reminder.message, Reminder.reminder_time)
+        .where(
+            Reminder.user_id == current_user.id,
+            Reminder.is_sent == False,
+            Reminder.reminder_time >= now
+        )
+        .order_by(Reminder.reminder_time.asc())
+        .limit(5)
+    ).mappings()]
     
-    # Calculate completion rate
-    completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+    context = {
+        'total_tasks': total_tasks,
+        'completed_tasks': completed_tasks,
+        'pending_tasks': active_tasks,  # This now includes both pending and in_progress
+        'upcoming_tasks': upcoming_tasks,
+        'overdue_tasks': overdue_tasks,
+        'upcoming_reminders': upcoming_reminders,
+        'completion_rate': float(completion_rate)
+    }
+    # The upcoming/overdue split is only right until the next upcoming deadline or
+    # reminder comes due, so the entry must not outlive it
+    timeout = DASHBOARD_CACHE_TIMEOUT
+    if upcoming_tasks:
+        timeout = min(timeout, math.ceil((upcoming_tasks[0]['deadline'] - now).total_seconds()))
+    if upcoming_reminders:
+        timeout = min(timeout, math.ceil((upcoming_reminders[0]['reminder_time'] - now).total_seconds()))
+    if timeout > 0:
+        cache.set(cache_key, context, timeout=timeout)
     
-    return render_template('dashboard.html',
-                         total_tasks=total_tasks,
-                         completed_tasks=completed_tasks,
-                         pending_tasks=active_tasks,  # This now includes both pending and in_progress
-                         upcoming_tasks=upcoming_tasks,
-                         overdue_tasks=overdue_tasks,
-                         upcoming_reminders=upcoming_reminders,
-                         completion_rate=round(completion_rate, 1))
+    return render_template('dashboard.html', now=now, **context)
 
 
 @app.route('/tasks')
@@ -319,7 +686,8 @@ def tasks():
     category_filter = request.args.get('category', 'all')
     search_query = request.args.get('search', '').strip()
     
-    query = Task.query.filter_by(user_id=current_user.id)
+    # Relationships are never rendered in the list; raise instead of lazy loading per row
+    query = Task.query.options(raiseload('*')).filter_by(user_id=current_user.id)
     
     if status_filter != 'all':
         query = query.filter_by(status=status_filter)
@@ -336,10 +704,11 @@ def tasks():
             )
         )
     
-    tasks = query.order_by(Task.deadline.asc()).all()
+    pagination = query.order_by(Task.deadline.asc()).paginate(per_page=TASKS_PER_PAGE, error_out=False)
     
-    return render_template('tasks.html', tasks=tasks, status_filter=status_filter, 
-                         category_filter=category_filter, search_query=search_query)
+    return render_template('tasks.html', tasks=pagination.items, pagination=pagination,
+                         status_filter=status_filter, category_filter=category_filter,
+                         search_query=search_query)
 
 
 @app.route('/task/new', methods=['GET', 'POST'])
@@ -349,20 +718,15 @@ def new_task():
     
     if form.validate_on_submit():
         try:
-            # Get deadline from form (this is in user's LOCAL time)
-            deadline_local = form.deadline.data
-            now_local = datetime.now()
-            now_utc = datetime.now(timezone.utc)
+            # Get deadline from form (this is in user's LOCAL time) and convert to UTC
+            deadline_utc = local_to_utc(form.deadline.data)
+            now = utcnow()
             
-            # Validate deadline is in the future (using local time)
-            if deadline_local <= now_local:
+            # Validate deadline is in the future
+            if deadline_utc <= now:
                 flash('Deadline must be in the future.', 'warning')
                 return render_template('task_form.html', form=form, title='New Task')
             
-            # Convert local time to UTC
-            utc_offset = now_local - now_utc.replace(tzinfo=None)
-            deadline_utc = deadline_local - utc_offset
-            
             task = Task(
                 title=form.title.data.strip(),
                 description=form.description.data.strip() if form.description.data else None,
@@ -372,11 +736,12 @@ def new_task():
                 user_id=current_user.id
             )
             db.session.add(task)
-            db.session.commit()
+            db.session.flush()  # Assigns task.id without ending the transaction
             
             # Create automatic reminder 1 day before deadline
             reminder_time_utc = deadline_utc - timedelta(days=1)
-            if reminder_time_utc > now_utc:
+            reminder_created = reminder_time_utc > now
+            if reminder_created:
                 reminder = Reminder(
                     title=f"Reminder: {task.title}",
                     message=f"Your task '{task.title}' is due tomorrow!",
@@ -385,8 +750,13 @@ def new_task():
                     task_id=task.id
                 )
                 db.session.add(reminder)
-                db.session.commit()
             
+            # Task and reminder are saved in a single transaction
+            db.session.commit()
+            
+            if reminder_created:
+                schedule_next_reminder()
+            invalidate_user_cache(current_user.id)
             flash('Task created successfully!', 'success')
             return redirect(url_for('tasks'))
             
@@ -400,25 +770,18 @@ def new_task():
 @app.route('/task/<int:task_id>/edit', methods=['GET', 'POST'])
 @login_required
 def edit_task(task_id):
-    task = Task.query.get_or_404(task_id)
-    
-    if task.user_id != current_user.id:
-        flash('You do not have permission to edit this task.', 'danger')
-        return redirect(url_for('tasks'))
+    task = get_owned_or_404(Task, task_id)
     
     form = TaskForm(obj=task)
     
     if form.validate_on_submit():
         try:
             # Get deadline from form (local time) and convert to UTC
-            deadline_local = form.deadline.data
-            now_local = datetime.now()
-            now_utc = datetime.now(timezone.utc)
-            utc_offset = now_local - now_utc.replace(tzinfo=None)
-            deadline_utc = deadline_local - utc_offset
+            deadline_utc = local_to_utc(form.deadline.data)
+            now = utcnow()
             
             # Validate deadline is in the future for non-completed tasks
-            if task.status != 'completed' and deadline_local <= now_local:
+            if task.status != 'completed' and deadline_utc <= now:
                 flash('Deadline must be in the future for active tasks.', 'warning')
                 return render_template('task_form.html', form=form, title='Edit Task', task=task)
             
@@ -427,9 +790,10 @@ def edit_task(task_id):
             task.category = form.category.data
             task.priority = form.priority.data
             task.deadline = deadline_utc
-            task.updated_at = now_utc
+            task.updated_at = now
             
             db.session.commit()
+            invalidate_user_cache(current_user.id)
             flash('Task updated successfully!', 'success')
             return redirect(url_for('tasks'))
             
@@ -444,14 +808,25 @@ def edit_task(task_id):
 @login_required
 @csrf.exempt
 def delete_task(task_id):
-    task = Task.query.get_or_404(task_id)
+    # Delete without loading the task; the user_id condition enforces ownership.
+    # Bulk deletes skip ORM cascades, so the task's reminders and progress go first.
+    reminders_deleted = db.session.execute(
+        delete(Reminder).where(Reminder.task_id == task_id, Reminder.user_id == current_user.id)
+    ).rowcount
+    db.session.execute(delete(Progress).where(Progress.task_id == task_id, Progress.user_id == current_user.id))
+    deleted = db.session.execute(
+        delete(Task).where(Task.id == task_id, Task.user_id == current_user.id)
+    ).rowcount
     
-    if task.user_id != current_user.id:
-        flash('You do not have permission to delete this task.', 'danger')
-        return redirect(url_for('tasks'))
+    if not deleted:
+        db.session.rollback()
+        abort(404)
     
-    db.session.delete(task)
     db.session.commit()
+    if reminders_deleted:
+        # Move the pending check off a reminder that no longer exists
+        schedule_next_reminder()
+    invalidate_user_cache(current_user.id)
     flash('Task deleted successfully!', 'success')
     return redirect(url_for('tasks'))
 
@@ -459,27 +834,35 @@ def delete_task(task_id):
 @app.route('/task/<int:task_id>/complete', methods=['POST'])
 @login_required
 def complete_task(task_id):
-    task = Task.query.get_or_404(task_id)
-    
-    if task.user_id != current_user.id:
-        return jsonify({'error': 'Unauthorized'}), 403
-    
     try:
-        task.status = 'completed'
-        task.completed_at = datetime.utcnow()
+        # Update without loading the task; the user_id condition enforces ownership
+        updated = db.session.execute(
+            update(Task)
+            .where(Task.id == task_id, Task.user_id == current_user.id)
+            .values(status='completed', completed_at=utcnow())
+        ).rowcount
         
-        # Update progress to 100%
-        progress = Progress.query.filter_by(task_id=task.id).order_by(Progress.recorded_at.desc()).first()
-        if not progress or progress.progress_percentage != 100:
-            new_progress = Progress(
-                progress_percentage=100,
-                notes='Task completed',
-                user_id=current_user.id,
-                task_id=task.id
+        if not updated:
+            db.session.rollback()
+            return jsonify({'error': 'Task not found'}), 404
+        
+        # Record 100% progress in the same statement, unless the latest entry already is 100%
+        latest_progress = select(Progress.progress_percentage)\
+            .where(Progress.task_id == task_id)\
+            .order_by(Progress.recorded_at.desc())\
+            .limit(1).scalar_subquery()
+        db.session.execute(
+            insert(Progress).from_select(
+                ['progress_percentage', 'notes', 'recorded_at', 'user_id', 'task_id'],
+                select(
+                    literal(100), literal('Task completed'), literal(utcnow()),
+                    literal(current_user.id), literal(task_id)
+                ).where(func.coalesce(latest_progress, -1) != 100)
             )
-            db.session.add(new_progress)
+        )
         
         db.session.commit()
+        invalidate_user_cache(current_user.id)
         return jsonify({'success': True, 'message': 'Task marked as complete!'})
         
     except Exception as e:
@@ -492,26 +875,29 @@ def complete_task(task_id):
 @csrf.exempt
 def update_task_status(task_id):
     """Update task status via AJAX"""
-    task = Task.query.get_or_404(task_id)
-    
-    if task.user_id != current_user.id:
-        return jsonify({'error': 'Unauthorized'}), 403
-    
     try:
         new_status = request.json.get('status')
         
         if new_status not in ['pending', 'in_progress', 'completed']:
             return jsonify({'error': 'Invalid status'}), 400
         
-        task.status = new_status
+        # Update without loading the task; the user_id condition enforces ownership
+        # and updated_at is set by the column's onupdate
+        updated = db.session.execute(
+            update(Task)
+            .where(Task.id == task_id, Task.user_id == current_user.id)
+            .values(
+                status=new_status,
+                completed_at=utcnow() if new_status == 'completed' else None
+            )
+        ).rowcount
         
-        if new_status == 'completed':
-            task.completed_at = datetime.utcnow()
-        else:
-            task.completed_at = None
+        if not updated:
+            db.session.rollback()
+            return jsonify({'error': 'Task not found'}), 404
         
-        task.updated_at = datetime.utcnow()
         db.session.commit()
+        invalidate_user_cache(current_user.id)
         
         return jsonify({'success': True, 'message': f'Task status updated to {new_status.replace("_", " ").title()}'})
         
@@ -523,11 +909,7 @@ def update_task_status(task_id):
 @app.route('/task/<int:task_id>/progress', methods=['GET', 'POST'])
 @login_required
 def task_progress(task_id):
-    task = Task.query.get_or_404(task_id)
-    
-    if task.user_id != current_user.id:
-        flash('You do not have permission to view this task.', 'danger')
-        return redirect(url_for('tasks'))
+    task = get_owned_or_404(Task, task_id)
     
     form = ProgressForm()
     
@@ -544,12 +926,13 @@ def task_progress(task_id):
             # Update task status based on progress
             if form.progress_percentage.data == 100:
                 task.status = 'completed'
-                task.completed_at = datetime.utcnow()
+                task.completed_at = utcnow()
             elif form.progress_percentage.data > 0 and task.status == 'pending':
                 task.status = 'in_progress'
             
-            task.updated_at = datetime.utcnow()
+            task.updated_at = utcnow()
             db.session.commit()
+            invalidate_user_cache(current_user.id)
             flash('Progress updated successfully!', 'success')
             return redirect(url_for('task_progress', task_id=task.id))
             
@@ -565,14 +948,31 @@ def task_progress(task_id):
 @app.route('/reminders')
 @login_required
 def reminders():
-    upcoming_reminders = Reminder.query.filter_by(user_id=current_user.id, is_sent=False)\
-        .filter(Reminder.reminder_time >= datetime.utcnow())\
-        .order_by(Reminder.reminder_time.asc()).all()
+    now = utcnow()
+    
+    # Upcoming (unsent, still ahead) and past reminders come from one query: each row
+    # is tagged with its bucket and only the 10 most recent past ones are kept
+    bucket = case(
+        (db.and_(Reminder.is_sent == False, Reminder.reminder_time >= now), 'upcoming'),
+        else_='past'
+    )
+    ranked = select(
+        Reminder,
+        bucket.label('bucket'),
+        func.row_number().over(partition_by=bucket, order_by=Reminder.reminder_time.desc()).label('rn')
+    ).where(Reminder.user_id == current_user.id).subquery()
+    ranked_reminder = aliased(Reminder, ranked)
     
-    past_reminders = Reminder.query.filter_by(user_id=current_user.id)\
-        .filter(
-            (Reminder.is_sent == True) | (Reminder.reminder_time < datetime.utcnow())
-        ).order_by(Reminder.reminder_time.desc()).limit(10).all()
+    # The template shows the linked task title, so load those tasks in one batch
+    rows = db.session.execute(
+        select(ranked_reminder, ranked.c.bucket)
+        .where(db.or_(ranked.c.bucket == 'upcoming', ranked.c.rn <= 10))
+        .order_by(ranked.c.reminder_time.asc())
+        .options(selectinload(ranked_reminder.task), raiseload('*'))
+    ).all()
+    
+    upcoming_reminders = [reminder for reminder, row_bucket in rows if row_bucket == 'upcoming']
+    past_reminders = [reminder for reminder, row_bucket in reversed(rows) if row_bucket == 'past']
     
     return render_template('reminders.html', upcoming_reminders=upcoming_reminders, past_reminders=past_reminders)
 
@@ -586,23 +986,14 @@ def new_reminder():
         try:
             # Get the datetime from the form (this is in user's LOCAL time, but naive)
             reminder_time_local = form.reminder_time.data
+            reminder_time_utc = local_to_utc(reminder_time_local)
+            now = utcnow()
             
-            # Get current times for comparison
-            now_local = datetime.now()
-            now_utc = datetime.now(timezone.utc)
-            
-            # Validate reminder time is in the future (using local time)
-            if reminder_time_local <= now_local:
+            # Validate reminder time is in the future
+            if reminder_time_utc <= now:
                 flash('Reminder time must be in the future.', 'warning')
                 return render_template('reminder_form.html', form=form, title='New Reminder')
             
-            # Calculate the time difference between local and UTC
-            utc_offset = now_local - now_utc.replace(tzinfo=None)
-            
-            # Convert local time to UTC by subtracting the offset
-            # Remove tzinfo before storing (SQLite stores as naive datetime in UTC)
-            reminder_time_utc = reminder_time_local - utc_offset
-            
             reminder = Reminder(
                 title=form.title.data.strip(),
                 message=form.message.data.strip() if form.message.data else None,
@@ -611,13 +1002,13 @@ def new_reminder():
             )
             db.session.add(reminder)
             db.session.commit()
+            schedule_next_reminder()
+            invalidate_user_cache(current_user.id)
             
-            print(f"[REMINDER] Created new reminder: {reminder.title}")
-            print(f"[REMINDER] User entered (Local): {reminder_time_local}")
-            print(f"[REMINDER] Stored as (UTC): {reminder_time_utc}")
-            print(f"[REMINDER] Current Local Time: {now_local}")
-            print(f"[REMINDER] Current UTC Time: {now_utc}")
-            print(f"[REMINDER] UTC Offset: {utc_offset}")
+            logger.info("Created new reminder: %s", reminder.title)
+            logger.debug("User entered (Local): %s", reminder_time_local)
+            logger.debug("Stored as (UTC): %s", reminder_time_utc)
+            logger.debug("Current UTC Time: %s", now)
             
             flash('Reminder set successfully!', 'success')
             return redirect(url_for('reminders'))
@@ -625,8 +1016,7 @@ def new_reminder():
         except Exception as e:
             db.session.rollback()
             flash(f'Error creating reminder: {str(e)}', 'danger')
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error creating reminder")
     
     return render_template('reminder_form.html', form=form, title='New Reminder')
 
@@ -635,14 +1025,18 @@ def new_reminder():
 @login_required
 @csrf.exempt
 def delete_reminder(reminder_id):
-    reminder = Reminder.query.get_or_404(reminder_id)
+    # Delete without loading the reminder; the user_id condition enforces ownership
+    deleted = db.session.execute(
+        delete(Reminder).where(Reminder.id == reminder_id, Reminder.user_id == current_user.id)
+    ).rowcount
     
-    if reminder.user_id != current_user.id:
-        flash('You do not have permission to delete this reminder.', 'danger')
-        return redirect(url_for('reminders'))
+    if not deleted:
+        db.session.rollback()
+        abort(404)
     
-    db.session.delete(reminder)
     db.session.commit()
+    schedule_next_reminder()
+    invalidate_user_cache(current_user.id)
     flash('Reminder deleted successfully!', 'success')
     return redirect(url_for('reminders'))
 
@@ -650,10 +1044,8 @@ def delete_reminder(reminder_id):
 @app.route('/calendar')
 @login_required
 def calendar():
-    tasks = Task.query.filter_by(user_id=current_user.id).all()
-    reminders = Reminder.query.filter_by(user_id=current_user.id, is_sent=False).all()
-    
-    return render_template('calendar.html', tasks=tasks, reminders=reminders)
+    # Events are fetched by the calendar widget from /api/tasks
+    return render_template('calendar.html')
 
 
 @app.route('/profile')
@@ -695,7 +1087,15 @@ def enable_2fa():
             flash('Invalid verification code. Please try again.', 'danger')
     
     # Generate QR code
-    uri = current_user.get_2fa_uri()
+    img_str = render_qr_code(current_user.get_2fa_uri())
+    
+    return render_template('enable_2fa.html', form=form, qr_code=img_str, secret=current_user.two_factor_secret)
+
+
+@lru_cache(maxsize=64)
+def render_qr_code(uri):
+    """Render a QR code as a base64 PNG. The image only depends on the URI, so re-opening
+    the enable-2FA page (or a failed verification) reuses the already encoded image."""
     qr = qrcode.QRCode(version=1, box_size=10, border=5)
     qr.add_data(uri)
     qr.make(fit=True)
@@ -704,9 +1104,7 @@ def enable_2fa():
     # Convert to base64 for display
     buffered = BytesIO()
     img.save(buffered, format="PNG")
-    img_str = base64.b64encode(buffered.getvalue()).decode()
-    
-    return render_template('enable_2fa.html', form=form, qr_code=img_str, secret=current_user.two_factor_secret)
+    return base64.b64encode(buffered.getvalue()).decode()
 
 
 @app.route('/disable-2fa', methods=['POST'])
@@ -730,28 +1128,60 @@ def disable_2fa():
 
 @app.route('/favicon.ico')
 def favicon():
+    # Pages link the icon from /static directly; this covers clients that still ask for /favicon.ico
     return send_from_directory(os.path.join(app.root_path, 'static/images'),
-                             'logo.jpg', mimetype='image/jpeg')
+                             'logo.jpg', mimetype='image/jpeg', max_age=FAVICON_MAX_AGE)
 
 
 # API endpoints for calendar
 @app.route('/api/tasks')
 @login_required
 def api_tasks():
-    tasks = Task.query.filter_by(user_id=current_user.id).all()
+    cache_key = api_tasks_cache_key(current_user.id, user_cache_generation(current_user.id))
+    cached = cache.get(cache_key)
+    
+    if cached is None:
+        # The task list only changes when a task is added, edited or deleted, which
+        # always moves the row count or the latest updated_at
+        task_count, last_update = db.session.execute(
+            select(func.count(Task.id), func.max(Task.updated_at))
+            .where(Task.user_id == current_user.id)
+        ).one()
+        etag = hashlib.md5(f'{current_user.id}:{task_count}:{last_update}'.encode()).hexdigest()
+        body = None
+    else:
+        etag, body = cached
+    
+    # Flask-Compress appends the encoding (e.g. ":gzip") to the ETag it sends
+    if any(tag.split(':')[0] == etag for tag in request.if_none_match.as_set(include_weak=True)):
+        response = app.response_class(status=304)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
     
-    events = []
-    for task in tasks:
-        events.append({
+    if body is None:
+        # Only select the columns the calendar needs instead of hydrating full Task objects
+        tasks = db.session.execute(
+            select(Task.id, Task.title, Task.deadline, Task.priority, Task.category, Task.status)
+            .where(Task.user_id == current_user.id)
+        ).all()
+        
+        events = [{
             'id': task.id,
             'title': task.title,
-            'start': task.deadline.isoformat(),
+            'start': task.deadline,
             'className': f'task-{task.priority}',
             'category': task.category,
             'status': task.status
-        })
+        } for task in tasks]
+        
+        body = orjson.dumps(events)
+        cache.set(cache_key, (etag, body), timeout=DASHBOARD_CACHE_TIMEOUT)
     
-    return jsonify(events)
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
 
 
 @app.route('/api/check-reminders', methods=['GET'])
@@ -760,32 +1190,32 @@ def api_tasks():
 def api_check_reminders():
     """Check for pending reminders for current user"""
     try:
-        now = datetime.now(timezone.utc)
-        pending_reminders = Reminder.query.filter(
-            Reminder.user_id == current_user.id,
-            Reminder.reminder_time <= now,
-            Reminder.is_sent == False
+        now = utcnow()
+        pending_reminders = db.session.execute(
+            select(Reminder.id, Reminder.title, Reminder.message, Reminder.reminder_time)
+            .where(
+                Reminder.user_id == current_user.id,
+                Reminder.reminder_time <= now,
+                Reminder.is_sent == False
+            )
         ).all()
         
-        reminders_data = []
-        for reminder in pending_reminders:
-            reminders_data.append({
-                'id': reminder.id,
-                'title': reminder.title,
-                'message': reminder.message or 'Reminder alert!',
-                'time': reminder.reminder_time.strftime('%B %d, %Y at %I:%M %p')
-            })
+        reminders_data = [{
+            'id': reminder.id,
+            'title': reminder.title,
+            'message': reminder.message or 'Reminder alert!',
+            'time': reminder.reminder_time  # ISO 8601 UTC, formatted by the browser
+        } for reminder in pending_reminders]
         
-        print(f"[REMINDER] API: Found {len(reminders_data)} pending reminders for user {current_user.username}")
-        print(f"[REMINDER] API: Current time: {now}")
-        if reminders_data:
-            print(f"[REMINDER] API: Returning reminders: {[r['title'] for r in reminders_data]}")
-        return jsonify(reminders_data)
+        # Polled from every page, so these diagnostics are debug-only
+        logger.debug("API: Found %d pending reminders for user %s", len(reminders_data), current_user.id)
+        logger.debug("API: Current time: %s", now)
+        if reminders_data and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("API: Returning reminders: %s", [r['title'] for r in reminders_data])
+        return json_response(reminders_data)
     except Exception as e:
-        print(f"[ERROR] API Error in check-reminders: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({'error': str(e)}), 500
+        logger.exception("API Error in check-reminders")
+        return json_response({'error': str(e)}), 500
 
 
 @app.route('/api/mark-reminder-seen/<int:reminder_id>', methods=['POST'])
@@ -794,20 +1224,26 @@ def api_check_reminders():
 def mark_reminder_seen(reminder_id):
     """Mark a reminder as seen/sent"""
     try:
-        reminder = Reminder.query.get_or_404(reminder_id)
+        # Update without loading the reminder; the user_id condition enforces ownership
+        updated = db.session.execute(
+            update(Reminder)
+            .where(Reminder.id == reminder_id, Reminder.user_id == current_user.id)
+            .values(is_sent=True)
+        ).rowcount
         
-        if reminder.user_id != current_user.id:
-            print(f"[ERROR] API: Unauthorized access to reminder {reminder_id}")
-            return jsonify({'error': 'Unauthorized'}), 403
+        if not updated:
+            db.session.rollback()
+            logger.warning("API: Reminder %s not found for user %s", reminder_id, current_user.id)
+            return json_response({'error': 'Reminder not found'}), 404
         
-        reminder.is_sent = True
         db.session.commit()
+        invalidate_user_cache(current_user.id)
         
-        print(f"[SUCCESS] API: Reminder {reminder_id} marked as seen")
-        return jsonify({'success': True})
+        logger.debug("API: Reminder %s marked as seen", reminder_id)
+        return json_response({'success': True})
     except Exception as e:
-        print(f"[ERROR] API Error in mark-reminder-seen: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+        logger.exception("API Error in mark-reminder-seen")
+        return json_response({'error': str(e)}), 500
 
 
 @app.route('/api/ping', methods=['GET'])
@@ -839,43 +1275,58 @@ def forbidden_error(error):
 @login_required
 def export_tasks():
     """Export user's tasks to CSV file"""
-    try:
-        tasks = Task.query.filter_by(user_id=current_user.id).order_by(Task.deadline.asc()).all()
-        
-        # Create CSV in memory
+    # Rows are fetched from a server-side cursor in batches and each batch is written
+    # out as one chunk, so memory stays flat no matter how many tasks the user has.
+    # Only the exported columns are selected, as plain rows rather than Task objects.
+    rows = db.session.execute(
+        select(
+            Task.title, Task.description, Task.category, Task.priority, Task.status,
+            Task.deadline, Task.created_at, Task.completed_at
+        )
+        .where(Task.user_id == current_user.id)
+        .order_by(Task.deadline.asc())
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    
+    def generate():
         si = StringIO()
         writer = csv.writer(si)
+        fmt = '%Y-%m-%d %H:%M'
         
         # Write header
         writer.writerow(['Title', 'Description', 'Category', 'Priority', 'Status', 'Deadline', 'Created', 'Completed'])
         
         # Write tasks
-        for task in tasks:
-            writer.writerow([
-                task.title,
-                task.description or '',
-                task.category,
-                task.priority,
-                task.status,
-                task.deadline.strftime('%Y-%m-%d %H:%M'),
-                task.created_at.strftime('%Y-%m-%d %H:%M'),
-                task.completed_at.strftime('%Y-%m-%d %H:%M') if task.completed_at else ''
-            ])
-        
-        output = si.getvalue()
-        si.close()
+        for batch in rows.partitions():
+            writer.writerows((
+                title,
+                description or '',
+                category,
+                priority,
+                status,
+                deadline.strftime(fmt),
+                created_at.strftime(fmt),
+                completed_at.strftime(fmt) if completed_at else ''
+            ) for title, description, category, priority, status, deadline, created_at, completed_at in batch)
+            yield si.getvalue()
+            si.seek(0)
+            si.truncate(0)
         
-        # Create response
-        from flask import Response
-        response = Response(output, mimetype='text/csv')
-        response.headers['Content-Disposition'] = f'attachment; filename=tasknest_tasks_{datetime.utcnow().strftime("%Y%m%d")}.csv'
-        
-        flash('Tasks exported successfully!', 'success')
-        return response
-        
-    except Exception as e:
-        flash(f'Error exporting tasks: {str(e)}', 'danger')
-        return redirect(url_for('tasks'))
+        yield si.getvalue()
+    
+    chunks = generate()
+    gzipped = request.accept_encodings['gzip'] > 0
+    if gzipped:
+        chunks = gzip_chunks(chunks)
+    
+    # Create response
+    response = Response(stream_with_context(chunks), mimetype='text/csv')
+    response.headers['Content-Disposition'] = f'attachment; filename=tasknest_tasks_{utcnow().strftime("%Y%m%d")}.csv'
+    if gzipped:
+        response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    
+    return response
 
 
 # Profile update route
@@ -911,17 +1362,40 @@ def edit_profile():
     return render_template('profile_edit.html')
 
 
-# Create tables
-with app.app_context():
+# Creating tables on import is opt-in; otherwise run `flask init-db` once per database
+if app.config['AUTO_CREATE_TABLES']:
+    with app.app_context():
+        db.create_all()
+
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create any missing database tables."""
     db.create_all()
+    click.echo('Database tables created.')
+
+
+@app.cli.command('run-scheduler')
+def run_scheduler_command():
+    """Run the reminder scheduler in its own process, outside the web workers."""
+    start_scheduler()
+    try:
+        while True:
+            time.sleep(3600)
+    except (KeyboardInterrupt, SystemExit):
+        scheduler.shutdown()
 
 
 if __name__ == '__main__':
-    # Start the scheduler only in the main process (not in reloader child process)
-    import os
-    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
-        # This is the reloader child process
+    # Development server only - use `gunicorn -c gunicorn.conf.py wsgi:app` in production
+    debug = os.environ.get('FLASK_DEBUG', '1') == '1'
+
+    with app.app_context():
+        db.create_all()
+
+    # Start the scheduler only in the main process (not in reloader parent process)
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
         start_scheduler()
-        print("[INFO] Scheduler started in main worker process")
+        logger.info("Scheduler started in main worker process")
     
-    app.run(debug=True, host='0.0.0.0', port=5000, use_reloader=True)
+    app.run(debug=debug, host='0.0.0.0', port=5000, use_reloader=debug)
@@ -1,8 +1,31 @@
 from flask_wtf import FlaskForm
 from wtforms import StringField, PasswordField, SubmitField, TextAreaField, SelectField, DateTimeLocalField, BooleanField
 from wtforms.validators import DataRequired, Email, EqualTo, Length, ValidationError, Regexp
-from models import User
-import re
+from sqlalchemy import select, exists
+from models import db, User
+import string
+
+# Character classes for password strength checks
+PASSWORD_UPPER = frozenset(string.ascii_uppercase)
+PASSWORD_LOWER = frozenset(string.ascii_lowercase)
+PASSWORD_DIGITS = frozenset(string.digits)
+PASSWORD_SPECIAL = frozenset('!@#$%^&*(),.?":{}|<>')
+WEAK_PASSWORDS = frozenset({'password', 'Password123', '12345678', 'qwerty123'})
+
+# Select field choices, shared by every form instance
+CATEGORY_CHOICES = (
+    ('general', 'General'),
+    ('assignment', 'Assignment'),
+    ('project', 'Project'),
+    ('exam', 'Exam'),
+    ('cat', 'CAT')
+)
+PRIORITY_CHOICES = (
+    ('low', 'Low'),
+    ('medium', 'Medium'),
+    ('high', 'High')
+)
+PROGRESS_CHOICES = tuple((percentage, f'{percentage}%') for percentage in range(0, 101, 10))
 
 class RegistrationForm(FlaskForm):
     username = StringField('Username', validators=[
@@ -35,38 +58,37 @@ class RegistrationForm(FlaskForm):
         if username.data.lower() in inappropriate_words:
             raise ValidationError('This username is not allowed.')
         
-        user = User.query.filter_by(username=username.data).first()
-        if user:
+        # Existence check on the unique index; no User row is loaded
+        if db.session.scalar(select(exists().where(User.username == username.data))):
             raise ValidationError('Username already exists. Please choose a different one.')
     
     def validate_email(self, email):
-        user = User.query.filter_by(email=email.data).first()
-        if user:
+        if db.session.scalar(select(exists().where(User.email == email.data))):
             raise ValidationError('Email already registered. Please use a different one.')
     
     def validate_password(self, password):
         """Enhanced password validation"""
         pwd = password.data
+        chars = set(pwd)
         
         # Check for at least one uppercase letter
-        if not re.search(r'[A-Z]', pwd):
+        if chars.isdisjoint(PASSWORD_UPPER):
             raise ValidationError('Password must contain at least one uppercase letter')
         
         # Check for at least one lowercase letter
-        if not re.search(r'[a-z]', pwd):
+        if chars.isdisjoint(PASSWORD_LOWER):
             raise ValidationError('Password must contain at least one lowercase letter')
         
         # Check for at least one digit
-        if not re.search(r'\d', pwd):
+        if chars.isdisjoint(PASSWORD_DIGITS):
             raise ValidationError('Password must contain at least one number')
         
         # Check for at least one special character
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', pwd):
+        if chars.isdisjoint(PASSWORD_SPECIAL):
             raise ValidationError('Password must contain at least one special character (!@#$%^&*...)')
         
         # Check for common weak passwords
-        weak_passwords = ['password', 'Password123', '12345678', 'qwerty123']
-        if pwd in weak_passwords:
+        if pwd in WEAK_PASSWORDS:
             raise ValidationError('This password is too common. Please choose a stronger password.')
 
 
@@ -96,18 +118,8 @@ class Enable2FAForm(FlaskForm):
 class TaskForm(FlaskForm):
     title = StringField('Task Title', validators=[DataRequired(), Length(max=200)])
     description = TextAreaField('Description')
-    category = SelectField('Category', choices=[
-        ('general', 'General'),
-        ('assignment', 'Assignment'),
-        ('project', 'Project'),
-        ('exam', 'Exam'),
-        ('cat', 'CAT')
-    ])
-    priority = SelectField('Priority', choices=[
-        ('low', 'Low'),
-        ('medium', 'Medium'),
-        ('high', 'High')
-    ])
+    category = SelectField('Category', choices=CATEGORY_CHOICES)
+    priority = SelectField('Priority', choices=PRIORITY_CHOICES)
     deadline = DateTimeLocalField('Deadline', format='%Y-%m-%dT%H:%M', validators=[DataRequired()])
     submit = SubmitField('Save Task')
 
@@ -120,9 +132,6 @@ class ReminderForm(FlaskForm):
 
 
 class ProgressForm(FlaskForm):
-    progress_percentage = SelectField('Progress', choices=[
-        (0, '0%'), (10, '10%'), (20, '20%'), (30, '30%'), (40, '40%'),
-        (50, '50%'), (60, '60%'), (70, '70%'), (80, '80%'), (90, '90%'), (100, '100%')
-    ], coerce=int)
+    progress_percentage = SelectField('Progress', choices=PROGRESS_CHOICES, coerce=int)
     notes = TextAreaField('Notes')
     submit = SubmitField('Update Progress')
\ No newline at end of file
@@ -0,0 +1,52 @@
+"""Gunicorn settings for running TaskNest in production"""
+import fcntl
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', '4'))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+keepalive = 15
+# Load the app once in the master so workers share it copy-on-write
+preload_app = True
+
+# Set RUN_SCHEDULER_IN_WEB=0 when the scheduler runs as its own process (`flask run-scheduler`)
+RUN_SCHEDULER_IN_WEB = os.environ.get('RUN_SCHEDULER_IN_WEB', '1') == '1'
+SCHEDULER_LOCK_FILE = os.environ.get('SCHEDULER_LOCK_FILE', '/tmp/tasknest-scheduler.lock')
+_scheduler_lock = None
+
+
+def when_ready(server):
+    """Compile every template in the master so workers inherit them via fork"""
+    from app import app
+
+    for name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(name)
+
+
+def post_fork(server, worker):
+    """Reset inherited DB connections and start the scheduler in one worker"""
+    global _scheduler_lock
+    from app import app, db, start_log_listener, start_scheduler
+
+    # Threads do not survive fork; the worker needs its own log queue listener
+    start_log_listener()
+
+    # Connections opened in the master (e.g. AUTO_CREATE_TABLES) must not be shared across processes
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+    if not RUN_SCHEDULER_IN_WEB:
+        return
+
+    # Only the worker holding the lock runs the scheduler. The lock is released
+    # when that worker exits, so its replacement picks the scheduler back up.
+    lock = open(SCHEDULER_LOCK_FILE, 'w')
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return
+    _scheduler_lock = lock
+    start_scheduler()
+    server.log.info("Reminder scheduler started in worker %s", worker.pid)
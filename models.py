@@ -1,21 +1,89 @@
 from datetime import datetime, timezone
+from flask import g, has_request_context
 from flask_sqlalchemy import SQLAlchemy
-from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import event, DDL, and_, update
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.engine import Engine
+from werkzeug.security import check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
+from functools import lru_cache
+import sqlite3
 import pyotp
 
 db = SQLAlchemy()
 
-class User(UserMixin, db.Model):
+UTC = timezone.utc
+
+
+def utcnow():
+    """Current UTC time as a naive datetime, which is how every DateTime column stores it"""
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def request_now():
+    """utcnow() taken once per request, so per-row checks on a page share one timestamp"""
+    if not has_request_context():
+        return utcnow()
+    if 'now' not in g:
+        g.now = utcnow()
+    return g.now
+
+
+# Argon2id hashing runs in C and releases the GIL, so a login does not block the
+# other threads of a worker while the hash is computed. The parameters are the OWASP
+# m=19456, t=2, p=1 profile and must be the same on every host: check_password
+# rehashes any stored hash whose parameters differ from these.
+password_hasher = PasswordHasher(
+    time_cost=2,
+    memory_cost=19456,  # KiB
+    parallelism=1
+)
+
+
+@lru_cache(maxsize=256)
+def totp_for(secret):
+    """TOTP for a 2FA secret; keyed on the secret so a regenerated one never hits a stale entry"""
+    return pyotp.TOTP(secret)
+
+
+# pg_trgm provides the gin_trgm_ops operator class used by the task search indexes
+event.listen(
+    db.metadata, 'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql')
+)
+
+
+
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Run SQLite (local development) with foreign keys enforced, and in WAL mode so page loads are not blocked while the scheduler writes"""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA foreign_keys=ON')  # enforces the ON DELETE CASCADE rules
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.execute('PRAGMA mmap_size=268435456')  # 256 MiB
+    cursor.close()
+
+
+class User(db.Model):
     __tablename__ = 'users'
     
+    # Flask-Login user interface, defined here rather than inherited from UserMixin
+    is_authenticated = True
+    is_active = True
+    is_anonymous = False
+    
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
     full_name = db.Column(db.String(120))
     class_name = db.Column(db.String(50))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=utcnow)
     
     # 2FA fields
     two_factor_enabled = db.Column(db.Boolean, default=False)
@@ -27,15 +95,42 @@ class User(UserMixin, db.Model):
     last_login = db.Column(db.DateTime, nullable=True)
     
     # Relationships
-    tasks = db.relationship('Task', backref='owner', lazy='dynamic', cascade='all, delete-orphan')
-    reminders = db.relationship('Reminder', backref='user', lazy='dynamic', cascade='all, delete-orphan')
-    progress_records = db.relationship('Progress', backref='user', lazy='dynamic', cascade='all, delete-orphan')
+    # Collections stay lazy: load_user runs on every request and must not pull in a
+    # user's whole task list. Views that need related rows eager load them per query.
+    # Deleting a parent leaves its children to the database's ON DELETE CASCADE
+    # instead of loading and deleting them one by one.
+    tasks = db.relationship('Task', back_populates='owner', cascade='all, delete-orphan', passive_deletes=True)
+    reminders = db.relationship('Reminder', back_populates='user', cascade='all, delete-orphan', passive_deletes=True)
+    progress_records = db.relationship('Progress', back_populates='user', cascade='all, delete-orphan', passive_deletes=True)
+    
+    def get_id(self):
+        return str(self.id)
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        """Verify a password, upgrading the stored hash when it is outdated.
+
+        The upgraded hash is saved by the caller's next commit.
+        """
+        # Not a hash either hasher can produce; nothing to verify against
+        if not self.password_hash or '$' not in self.password_hash:
+            return False
+        if self.password_hash.startswith('$argon2'):
+            try:
+                password_hasher.verify(self.password_hash, password)
+            except (VerificationError, InvalidHashError):
+                return False
+            if password_hasher.check_needs_rehash(self.password_hash):
+                self.set_password(password)
+            return True
+        # Accounts created before the switch to argon2 still have Werkzeug hashes;
+        # they are moved to argon2 on their first successful login
+        if check_password_hash(self.password_hash, password):
+            self.set_password(password)
+            return True
+        return False
     
     def generate_2fa_secret(self):
         """Generate a new 2FA secret"""
@@ -46,7 +141,7 @@ class User(UserMixin, db.Model):
         """Get the provisioning URI for QR code"""
         if not self.two_factor_secret:
             self.generate_2fa_secret()
-        return pyotp.totp.TOTP(self.two_factor_secret).provisioning_uri(
+        return totp_for(self.two_factor_secret).provisioning_uri(
             name=self.email,
             issuer_name='TaskNest'
         )
@@ -55,20 +150,21 @@ class User(UserMixin, db.Model):
         """Verify a 2FA token"""
         if not self.two_factor_secret:
             return False
-        totp = pyotp.TOTP(self.two_factor_secret)
-        return totp.verify(token, valid_window=1)
+        return totp_for(self.two_factor_secret).verify(token, valid_window=1)
+    
+    @classmethod
+    def record_successful_login(cls, user_id):
+        """Clear the failed-attempt lockout and stamp last_login in one UPDATE"""
+        db.session.execute(
+            update(cls)
+            .where(cls.id == user_id)
+            .values(failed_login_attempts=0, account_locked_until=None, last_login=utcnow())
+        )
+        db.session.commit()
     
     def is_account_locked(self):
-        """Check if account is locked"""
-        if self.account_locked_until:
-            if datetime.utcnow() < self.account_locked_until:
-                return True
-            else:
-                # Unlock account if time has passed
-                self.account_locked_until = None
-                self.failed_login_attempts = 0
-                db.session.commit()
-        return False
+        """Check if account is locked. Read-only: an expired lock is cleared by the login view."""
+        return self.account_locked_until is not None and request_now() < self.account_locked_until
     
     def __repr__(self):
         return f'<User {self.username}>'
@@ -76,6 +172,15 @@ class User(UserMixin, db.Model):
 
 class Task(db.Model):
     __tablename__ = 'tasks'
+    __table_args__ = (
+        db.Index('ix_task_user_deadline', 'user_id', 'deadline'),
+        db.Index('ix_task_user_status_deadline', 'user_id', 'status', 'deadline'),
+        # Trigram indexes let the task search's ILIKE '%...%' use an index scan (PostgreSQL only)
+        db.Index('ix_task_title_trgm', 'title', postgresql_using='gin',
+                 postgresql_ops={'title': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+        db.Index('ix_task_description_trgm', 'description', postgresql_using='gin',
+                 postgresql_ops={'description': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -84,22 +189,30 @@ class Task(db.Model):
     priority = db.Column(db.String(20), default='medium')  # low, medium, high
     status = db.Column(db.String(20), default='pending')  # pending, in_progress, completed
     deadline = db.Column(db.DateTime, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=utcnow)
+    updated_at = db.Column(db.DateTime, default=utcnow, onupdate=utcnow)
     completed_at = db.Column(db.DateTime)
     
     # The foreign Keys
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     
     # The relationships
-    reminders = db.relationship('Reminder', backref='task', lazy='dynamic', cascade='all, delete-orphan')
-    progress_records = db.relationship('Progress', backref='task', lazy='dynamic', cascade='all, delete-orphan')
+    owner = db.relationship('User', back_populates='tasks')
+    reminders = db.relationship('Reminder', back_populates='task', cascade='all, delete-orphan', passive_deletes=True)
+    progress_records = db.relationship('Progress', back_populates='task', cascade='all, delete-orphan', passive_deletes=True)
     
+    @hybrid_property
     def is_overdue(self):
-        return datetime.utcnow() > self.deadline and self.status != 'completed'
+        return request_now() > self.deadline and self.status != 'completed'
+    
+    @is_overdue.inplace.expression
+    @classmethod
+    def _is_overdue_expression(cls):
+        # Compared against a bound naive-UTC timestamp, like the stored deadlines
+        return and_(cls.deadline < request_now(), cls.status != 'completed')
     
     def days_remaining(self):
-        delta = self.deadline - datetime.utcnow()
+        delta = self.deadline - request_now()
         return delta.days
     
     def __repr__(self):
@@ -108,33 +221,75 @@ class Task(db.Model):
 
 class Reminder(db.Model):
     __tablename__ = 'reminders'
+    __table_args__ = (
+        db.Index('ix_reminder_user_time_sent', 'user_id', 'reminder_time', 'is_sent'),
+        # Partial index holding only unsent reminders, used by the reminder scheduler
+        db.Index('ix_reminder_pending', 'reminder_time',
+                 postgresql_where=db.text('is_sent = false'),
+                 sqlite_where=db.text('is_sent = 0')),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     message = db.Column(db.Text)
     reminder_time = db.Column(db.DateTime, nullable=False)
     is_sent = db.Column(db.Boolean, default=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=utcnow)
     
     # The foreign Keys
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    task_id = db.Column(db.Integer, db.ForeignKey('tasks.id'), nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    task_id = db.Column(db.Integer, db.ForeignKey('tasks.id', ondelete='CASCADE'), nullable=True)
+    
+    # The relationships
+    user = db.relationship('User', back_populates='reminders')
+    task = db.relationship('Task', back_populates='reminders')
     
     def __repr__(self):
         return f'<Reminder {self.title}>'
 
 
+# On PostgreSQL, adding, deleting or re-timing reminders announces itself on the
+# 'reminders_changed' channel so the scheduler re-arms its next check right away
+event.listen(
+    Reminder.__table__, 'after_create',
+    DDL("""
+        CREATE OR REPLACE FUNCTION notify_reminders_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('reminders_changed', '');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """).execute_if(dialect='postgresql')
+)
+event.listen(
+    Reminder.__table__, 'after_create',
+    DDL("""
+        CREATE TRIGGER reminders_changed
+        AFTER INSERT OR DELETE OR UPDATE OF reminder_time ON reminders
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_reminders_changed()
+    """).execute_if(dialect='postgresql')
+)
+
+
 class Progress(db.Model):
     __tablename__ = 'progress'
+    __table_args__ = (
+        # Latest progress entry for a task (ORDER BY recorded_at DESC)
+        db.Index('ix_progress_task_recorded', 'task_id', db.text('recorded_at DESC')),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     progress_percentage = db.Column(db.Integer, default=0)
     notes = db.Column(db.Text)
-    recorded_at = db.Column(db.DateTime, default=datetime.utcnow)
+    recorded_at = db.Column(db.DateTime, default=utcnow)
     
     # The foreign Keys
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    task_id = db.Column(db.Integer, db.ForeignKey('tasks.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    task_id = db.Column(db.Integer, db.ForeignKey('tasks.id', ondelete='CASCADE'), nullable=False)
+    
+    # The relationships
+    user = db.relationship('User', back_populates='progress_records')
+    task = db.relationship('Task', back_populates='progress_records')
     
     def __repr__(self):
         return f'<Progress {self.progress_percentage}%>'
@@ -149,10 +304,10 @@ class Exam(db.Model):
     exam_date = db.Column(db.DateTime, nullable=False)
     location = db.Column(db.String(100))
     notes = db.Column(db.Text)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=utcnow)
     
     # The foreign Keys
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     
     def __repr__(self):
         return f'<Exam {self.subject} - {self.exam_type}>'
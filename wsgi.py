@@ -0,0 +1,8 @@
+"""WSGI entry point for running TaskNest under Gunicorn.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+The reminder scheduler is started by the post_fork hook in gunicorn.conf.py
+so that only one worker runs it.
+"""
+from app import app